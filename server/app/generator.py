@@ -2,16 +2,26 @@
 """
 generator.py — deterministic puzzle generator built on solver.py
 
-Usage:
-  python generator.py --rows 6 --cols 6 --palette R G B --smooth 0.45 --seed 123 --log
+Usage (from server/):
+  python -m app.generator --rows 6 --cols 6 --palette R G B --smooth 0.45 --seed 123
 
-Output:
+Output (under the repository root):
   - boards/board_001.json (contains colors, clues, initial, meta)
   - logs/board_001_solver.txt / .json
+
+Profiling:
+  python -m app.generator --rows 10 --cols 10 --seed 7 --profile [--pstats [PATH]] [--collapsed [PATH]]
+
+  --profile adds a "profile" section to logs/board_###_solver.json with per-phase
+  wall/CPU time, solver-call counts and propagation rounds per call.
+  --pstats writes a cProfile dump (default logs/board_###_profile.pstats) and
+  --collapsed a flamegraph-compatible phase stack dump (default
+  logs/board_###_profile.collapsed). Both imply --profile.
 """
 
 from __future__ import annotations
 import argparse
+import cProfile
 import json
 import random
 import sys
@@ -20,12 +30,15 @@ from pathlib import Path
 from typing import List, Tuple, Iterable, Sequence, Optional
 from datetime import datetime, timezone
 
-from ..common.data import PROJECT_ROOT
 from .solver import SolverLogger, SolveResult, deterministic_solve
+from .grader import grade_board
+from .profiling import PhaseProfiler
 
 Color = str
 Coord = Tuple[int, int]
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
 # ---------- helpers ----------
 
 
@@ -84,8 +97,10 @@ def pick_best_reveal(
     unsolved: Iterable[Coord],
     rng: random.Random,
     sample_k: int = 12,
+    profiler: Optional[PhaseProfiler] = None,
 ) -> Coord:
     """Try several reveals and pick the one yielding the most fixed cells."""
+    prof = profiler or PhaseProfiler(enabled=False)
     init_set = set(initial)
     cand = [p for p in unsolved if p not in init_set]
     if not cand:
@@ -98,8 +113,7 @@ def pick_best_reveal(
     for (r, c) in cand:
         trial_init = init_set | {(r, c)}
         givens = {(rr, cc): colors[rr][cc] for (rr, cc) in trial_init}
-        res: SolveResult = deterministic_solve(
-            clues, palette, givens)
+        res: SolveResult = prof.solve(deterministic_solve, clues, palette, givens)
         gain = res.state.fixed_count
         if gain > best_gain:
             best_gain = gain
@@ -112,15 +126,19 @@ def minimality_pass(
     clues: List[List[Optional[int]]],
     palette: Sequence[Color],
     initial: Iterable[Coord],
+    profiler: Optional[PhaseProfiler] = None,
 ) -> list[Coord]:
     """Remove unnecessary givens while keeping deterministic solvability."""
+    prof = profiler or PhaseProfiler(enabled=False)
     initial_list = list(initial)
     kept: list[Coord] = []
-    for cell in initial_list:
-        trial = [x for x in initial_list if x != cell]
+    for i, cell in enumerate(initial_list):
+        # check against the givens still kept, not the original set, so two
+        # individually redundant givens are never both dropped
+        trial = kept + initial_list[i + 1:]
         try:
             givens = {p: colors[p[0]][p[1]] for p in trial}
-            res = deterministic_solve(clues, palette, givens)
+            res = prof.solve(deterministic_solve, clues, palette, givens)
             if res.fully_solved:
                 # redundant, skip
                 continue
@@ -138,32 +156,62 @@ def generate(
     smooth: float = 0.1,
     seed: Optional[int] = None,
     max_rounds: int = 200,
+    profiler: Optional[PhaseProfiler] = None,
+) -> dict:
+    prof = profiler or PhaseProfiler(enabled=False)
+    with prof.phase("generate"):
+        return _generate(R, C, palette, smooth, seed, max_rounds, prof)
+
+
+def _generate(
+    R: int,
+    C: int,
+    palette: Sequence[Color],
+    smooth: float,
+    seed: Optional[int],
+    max_rounds: int,
+    prof: PhaseProfiler,
 ) -> dict:
     rng = random.Random(seed)
 
     # Step 1: generate full solution and clues
-    colors = gen_colors(R, C, palette, smooth, rng)
-    clues = compute_clues(colors)
+    with prof.phase("gen_colors"):
+        colors = gen_colors(R, C, palette, smooth, rng)
+    with prof.phase("compute_clues"):
+        clues = compute_clues(colors)
 
     # Step 2: iterative reveal until deterministic solve completes
     initial: set[Coord] = set()
-    for round_i in range(max_rounds):
-        givens = {(r, c): colors[r][c] for (r, c) in initial}
-        res = deterministic_solve(clues, palette, givens)
-        if res.fully_solved:
-            break
-        unsolved = [(r, c) for r in range(R)
-                    for c in range(C) if res.state.fixed[r][c] is None]
-        if not unsolved:
-            break
-        pick = pick_best_reveal(
-            colors, clues, palette, initial, unsolved, rng, sample_k=max(6, (R * C) // 4))
-        initial.add(pick)
+    with prof.phase("reveal_loop"):
+        for round_i in range(max_rounds):
+            givens = {(r, c): colors[r][c] for (r, c) in initial}
+            res = prof.solve(deterministic_solve, clues, palette, givens)
+            if res.fully_solved:
+                break
+            unsolved = [(r, c) for r in range(R)
+                        for c in range(C) if res.state.fixed[r][c] is None]
+            if not unsolved:
+                break
+            with prof.phase("pick_best_reveal"):
+                pick = pick_best_reveal(
+                    colors, clues, palette, initial, unsolved, rng,
+                    sample_k=max(6, (R * C) // 4), profiler=prof)
+            initial.add(pick)
 
     # Step 3: minimality cleanup
-    initial_min = minimality_pass(colors, clues, palette, initial)
-
-    # Step 4: metadata
+    with prof.phase("minimality_pass"):
+        initial_min = minimality_pass(
+            colors, clues, palette, initial, profiler=prof)
+
+    # Step 4: grade from one traced solve of the final givens
+    with prof.phase("grade_board"):
+        grade = grade_board(colors, clues, palette,
+                            initial_min, profiler=prof)
+    if not grade.solved:
+        raise RuntimeError(
+            f"Board is not deterministically solvable after {max_rounds} reveal rounds.")
+
+    # Step 5: metadata
     colors_hash = hashlib.sha1(json.dumps(colors).encode()).hexdigest()[:12]
     meta = {
         "rows": R,
@@ -175,6 +223,8 @@ def generate(
         "generated_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
         "initial_count": len(initial_min),
         "colors_sha1_12": colors_hash,
+        "difficulty": grade.difficulty,
+        "grade": grade.as_meta(),
     }
 
     return {
@@ -212,21 +262,40 @@ def main(argv=None):
     ap.add_argument("--max-rounds", type=int, default=200)
     ap.add_argument("--base", type=str, default="board",
                     help="base name for output files")
+    ap.add_argument("--profile", action="store_true",
+                    help="record per-phase timing and solver stats in the log JSON")
+    ap.add_argument("--pstats", nargs="?", const="", default=None,
+                    help="also write a cProfile dump (implies --profile)")
+    ap.add_argument("--collapsed", nargs="?", const="", default=None,
+                    help="also write collapsed phase stacks for flamegraphs (implies --profile)")
     args = ap.parse_args(argv)
+    profiling = args.profile or args.pstats is not None or args.collapsed is not None
 
     ensure_dirs()
     out_path = next_board_filename(args.base)
 
     print(f"Generating puzzle → {out_path.name}")
 
-    data = generate(
-        R=args.rows,
-        C=args.cols,
-        palette=tuple(args.palette),
-        smooth=args.smooth,
-        seed=args.seed,
-        max_rounds=args.max_rounds,
-    )
+    profiler = PhaseProfiler(enabled=profiling)
+    cprof = cProfile.Profile() if args.pstats is not None else None
+    if cprof:
+        cprof.enable()
+    try:
+        data = generate(
+            R=args.rows,
+            C=args.cols,
+            palette=tuple(args.palette),
+            smooth=args.smooth,
+            seed=args.seed,
+            max_rounds=args.max_rounds,
+            profiler=profiler,
+        )
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        if cprof:
+            cprof.disable()
 
     # Write board JSON
     out_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
@@ -242,8 +311,22 @@ def main(argv=None):
     }
 
     log_txt.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    if profiling:
+        summary["profile"] = profiler.as_dict()
+        print(profiler.format_table())
     log_json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
 
+    if cprof:
+        pstats_path = Path(args.pstats or PROJECT_ROOT /
+                           "logs" / f"{log_base}_profile.pstats")
+        cprof.dump_stats(str(pstats_path))
+        print(f"🔬 cProfile stats saved to {pstats_path}")
+    if args.collapsed is not None:
+        collapsed_path = Path(args.collapsed or PROJECT_ROOT /
+                              "logs" / f"{log_base}_profile.collapsed")
+        profiler.write_collapsed(collapsed_path)
+        print(f"🔥 Collapsed stacks saved to {collapsed_path}")
+
     print(f"✅ Wrote {out_path} with {len(data['initial'])} initial cells")
     print(f"🗂️  Logs saved under logs/{log_base}_solver.*")
 
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+grader.py — difficulty grading from a single instrumented solver pass
+
+Usage (from server/):
+  python -m app.grader boards/*.json            # print grades
+  python -m app.grader boards/*.json --write    # re-grade archive in place
+  python -m app.grader boards/ --jobs 8 --summary grades.json
+
+A board is solved once from its `initial` givens with a DeductionTrace attached,
+and the trace yields the metrics:
+  - max / mean deduction depth over non-given cells
+  - rounds of propagation needed
+  - share of non-given cells that needed higher-order reasoning
+    (eliminations combined from several clues, or a non-base rule)
+
+Rounds and higher-order share are bucketed into meta.difficulty via
+DIFFICULTY_BUCKETS; the full metrics go to meta.grade.
+
+Only `neighbor` clues are supported (SOLVER_RULES); boards using any other
+rule are skipped rather than graded as a different puzzle.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Iterable
+
+from .profiling import PhaseProfiler
+from .solver import DeductionTrace, NeighborClueRule, deterministic_solve, neighbors8
+
+Color = str
+Coord = Tuple[int, int]
+
+FIRST_ORDER_RULES = frozenset({NeighborClueRule.name})
+
+# Board-file rule names (shared/rules.json) the Python solver can propagate.
+SOLVER_RULES = frozenset({"neighbor"})
+
+# (bucket, max propagation rounds, max higher-order share); first match wins.
+# Rounds rather than max depth: depth grows with board size, rounds much less.
+DIFFICULTY_BUCKETS: Tuple[Tuple[str, int, float], ...] = (
+    ("easy", 2, 0.05),
+    ("medium", 5, 0.10),
+    ("hard", 10, 0.25),
+)
+HARDEST_BUCKET = "expert"
+UNSOLVED_BUCKET = "unsolved"
+
+
+@dataclass
+class DifficultyGrade:
+    difficulty: str
+    solved: bool
+    rounds: int
+    max_depth: int
+    mean_depth: float
+    higher_order_share: float
+    deduced_cells: int
+    depth_grid: Optional[List[List[Optional[int]]]] = None
+
+    def as_meta(self) -> dict:
+        """Metrics for meta.grade (no per-cell grid)."""
+        d = asdict(self)
+        d.pop("depth_grid")
+        d.pop("difficulty")
+        return d
+
+
+def bucket_for(rounds: int, higher_order_share: float, solved: bool = True) -> str:
+    if not solved:
+        return UNSOLVED_BUCKET
+    for name, rounds_cap, share_cap in DIFFICULTY_BUCKETS:
+        if rounds <= rounds_cap and higher_order_share <= share_cap:
+            return name
+    return HARDEST_BUCKET
+
+
+def grade_board(
+    colors: List[List[Color]],
+    clues: List[List[Optional[int]]],
+    palette: Sequence[Color],
+    initial: Iterable[Coord],
+    keep_depth_grid: bool = False,
+    profiler: Optional[PhaseProfiler] = None,
+) -> DifficultyGrade:
+    """Grade a board with one traced deterministic_solve run."""
+    prof = profiler or PhaseProfiler(enabled=False)
+    givens = {(r, c): colors[r][c] for (r, c) in initial}
+    trace = DeductionTrace()
+    try:
+        res = prof.solve(deterministic_solve, clues, palette, givens, logger=trace)
+        solved = res.fully_solved
+    except ValueError:
+        solved = False
+
+    depths: List[int] = []
+    higher = 0
+    for r in range(trace.R):
+        for c in range(trace.C):
+            method = trace.method[r][c]
+            if method is None or method == "given":
+                continue
+            depths.append(trace.depth[r][c] or 0)
+            if method == "combined" or trace.rule[r][c] not in FIRST_ORDER_RULES:
+                higher += 1
+
+    max_depth = max(depths, default=0)
+    share = higher / len(depths) if depths else 0.0
+    return DifficultyGrade(
+        difficulty=bucket_for(trace.rounds, share, solved),
+        solved=solved,
+        rounds=trace.rounds,
+        max_depth=max_depth,
+        mean_depth=round(sum(depths) / len(depths), 3) if depths else 0.0,
+        higher_order_share=round(share, 4),
+        deduced_cells=len(depths),
+        depth_grid=trace.depth if keep_depth_grid else None,
+    )
+
+
+# ---------- board files ----------
+
+def neighbor_clues(colors: List[List[Color]]) -> List[List[int]]:
+    """8-neighbor same-color counts, as written by the generator."""
+    R, C = len(colors), len(colors[0])
+    return [[sum(1 for rr, cc in neighbors8(r, c, R, C) if colors[rr][cc] == colors[r][c])
+             for c in range(C)] for r in range(R)]
+
+
+def _solver_clues(board: dict) -> List[List[Optional[int]]]:
+    """Clue grid for the solver; raises ValueError for rules it cannot handle.
+
+    Generator boards store plain neighbor counts. Frontend-format boards store
+    sparse {"rule", "value"} objects, or no clues at all (every cell gets
+    meta.defaultRule, possibly overridden via ruleOverrides).
+    """
+    meta = board.get("meta", {})
+    used = set(meta.get("rules", []))
+    clues = board.get("clues")
+    if clues is None:
+        used |= {meta.get("defaultRule", "neighbor")}
+        used |= {o["rule"] for o in board.get("ruleOverrides") or []}
+    else:
+        used |= {v["rule"] for row in clues for v in row if isinstance(v, dict)}
+    unsupported = used - SOLVER_RULES
+    if unsupported:
+        raise ValueError(f"unsupported rules: {', '.join(sorted(unsupported))}")
+
+    if clues is None:
+        return neighbor_clues(board["colors"])
+    return [[v["value"] if isinstance(v, dict) else v for v in row] for row in clues]
+
+
+def _check_board(board: object):
+    """Raise ValueError unless `board` has the shape of a board file."""
+    colors = board.get("colors") if isinstance(board, dict) else None
+    if not (isinstance(colors, list) and colors
+            and all(isinstance(row, list) and row for row in colors)
+            and len({len(row) for row in colors}) == 1):
+        raise ValueError("not a board file")
+    initial = board.get("initial", [])
+    if not (isinstance(initial, list)
+            and all(isinstance(p, list) and len(p) == 2 for p in initial)):
+        raise ValueError("not a board file")
+
+
+def grade_data(board: dict) -> DifficultyGrade:
+    _check_board(board)
+    meta = board.get("meta", {})
+    colors = board["colors"]
+    palette = meta.get("palette") or sorted({x for row in colors for x in row})
+    initial = [tuple(p) for p in board.get("initial", [])]
+    return grade_board(colors, _solver_clues(board), palette, initial)
+
+
+def apply_grade(board: dict, grade: DifficultyGrade) -> dict:
+    meta = board.setdefault("meta", {})
+    meta["difficulty"] = grade.difficulty
+    meta["grade"] = grade.as_meta()
+    return board
+
+
+def grade_file(path: str | Path, write: bool = False) -> Tuple[str, DifficultyGrade]:
+    """Grade one board JSON; with write=True update its meta in place."""
+    p = Path(path)
+    board = json.loads(p.read_text(encoding="utf-8"))
+    grade = grade_data(board)
+    if write:
+        p.write_text(json.dumps(apply_grade(board, grade), indent=2), encoding="utf-8")
+    return str(p), grade
+
+
+def _grade_file_job(args: Tuple[str, bool]) -> Tuple[str, Optional[DifficultyGrade], Optional[str]]:
+    try:
+        path, grade = grade_file(*args)
+    except ValueError as e:
+        return args[0], None, str(e)
+    except (KeyError, TypeError, IndexError) as e:
+        return args[0], None, f"malformed board ({type(e).__name__}: {e})"
+    return path, grade, None
+
+
+def grade_batch(
+    paths: Sequence[str | Path],
+    write: bool = False,
+    jobs: Optional[int] = None,
+) -> List[Tuple[str, Optional[DifficultyGrade], Optional[str]]]:
+    """Grade many board files across a process pool (jobs=1 runs inline).
+
+    Returns (path, grade, skip_reason) per file; boards the solver cannot
+    handle get grade None and are left untouched even with write=True.
+    """
+    work = [(str(p), write) for p in paths]
+    if jobs == 1 or len(work) <= 1:
+        return [_grade_file_job(w) for w in work]
+    workers = jobs or os.cpu_count() or 1
+    chunk = max(1, len(work) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_grade_file_job, work, chunksize=chunk))
+
+
+def _expand(paths: Iterable[str]) -> List[Path]:
+    out: List[Path] = []
+    for s in paths:
+        p = Path(s)
+        out.extend(sorted(p.glob("*.json")) if p.is_dir() else [p])
+    return out
+
+
+# ---------- CLI ----------
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("paths", nargs="+", help="board JSON files or directories")
+    ap.add_argument("--write", action="store_true",
+                    help="store meta.difficulty / meta.grade back into each file")
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="worker processes (default: CPU count)")
+    ap.add_argument("--summary", type=str, default=None,
+                    help="write all grades to this JSON file")
+    args = ap.parse_args(argv)
+
+    files = _expand(args.paths)
+    results = grade_batch(files, write=args.write, jobs=args.jobs)
+
+    counts: dict = {}
+    for path, g, skipped in results:
+        if g is None:
+            counts["skipped"] = counts.get("skipped", 0) + 1
+            print(f"{Path(path).name:<24} skipped  ({skipped})")
+            continue
+        counts[g.difficulty] = counts.get(g.difficulty, 0) + 1
+        print(f"{Path(path).name:<24} {g.difficulty:<8} depth={g.max_depth:<3} "
+              f"rounds={g.rounds:<3} higher={g.higher_order_share:.2f}")
+
+    if args.summary:
+        Path(args.summary).write_text(json.dumps(
+            {path: {"difficulty": g.difficulty, **g.as_meta()} if g else {"skipped": skipped}
+             for path, g, skipped in results},
+            indent=2), encoding="utf-8")
+
+    print(f"✅ Graded {len(results) - counts.get('skipped', 0)} boards: "
+          + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+loadtest.py — asyncio load generator for the Color Mines API (main.py)
+
+Usage (from server/):
+  python -m app.loadtest --concurrency 16 --duration 20 --out reports/load.json
+  python -m app.loadtest --scenario scenarios/hints.json --rate 200 --compare reports/prev.json
+  python -m app.loadtest --url http://127.0.0.1:8000 --requests 5000
+
+By default a uvicorn instance of app.main:app is started on a free local port
+and stopped afterwards; pass --url to target a server that is already running.
+
+Scenario file (JSON, every key optional):
+  {
+    "name": "hint-heavy",
+    "mix": {"board": 1, "hint": 4, "healthz": 1},
+    "hint_states": [ {"state": {...}}, ... ]
+  }
+
+`hint_states` are replayed round-robin as POST /api/hint bodies. Without a
+scenario the mix is 1:1:1 and hint bodies are derived from the bundled board.
+
+Output:
+  - JSON report (sorted keys, stable layout) with latency percentiles,
+    throughput and error rates, overall and per endpoint
+  - with --compare, a per-metric delta table against an older report
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import math
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+from datetime import datetime, timezone
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+BOARD_FILE = Path(__file__).parent / "data" / "boards" / "board_001.json"
+
+PERCENTILES: Tuple[float, ...] = (50, 90, 95, 99)
+
+# ---------- scenario ----------
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    method: str
+    path: str
+
+
+ENDPOINTS: Dict[str, Endpoint] = {
+    "board": Endpoint("board", "GET", "/api/board"),
+    "hint": Endpoint("hint", "POST", "/api/hint"),
+    "healthz": Endpoint("healthz", "GET", "/healthz"),
+}
+
+
+@dataclass
+class Scenario:
+    name: str = "default"
+    mix: Dict[str, float] = field(
+        default_factory=lambda: {"board": 1.0, "hint": 1.0, "healthz": 1.0})
+    hint_states: List[dict] = field(default_factory=list)
+
+    def __post_init__(self):
+        unknown = set(self.mix) - set(ENDPOINTS)
+        if unknown:
+            raise ValueError(f"Unknown endpoint(s) in mix: {sorted(unknown)}")
+        if not any(w > 0 for w in self.mix.values()):
+            raise ValueError("Scenario mix needs at least one positive weight")
+        if not self.hint_states:
+            self.hint_states = [default_hint_state()]
+
+
+def default_hint_state() -> dict:
+    """A hint request for the bundled board with only its givens revealed."""
+    board = json.loads(BOARD_FILE.read_text(encoding="utf-8"))
+    return {"state": {"meta": board.get("meta", {}), "initial": board.get("initial", [])}}
+
+
+def load_scenario(path: str | Path) -> Scenario:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    kwargs = {k: data[k] for k in ("name", "mix", "hint_states") if k in data}
+    kwargs.setdefault("name", Path(path).stem)
+    return Scenario(**kwargs)
+
+
+# ---------- minimal HTTP/1.1 client ----------
+
+def parse_status_line(line: bytes) -> int:
+    """Status code from an HTTP/1.x status line; ValueError if it is malformed."""
+    parts = line.split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/") \
+            or len(parts[1]) != 3 or not parts[1].isdigit():
+        raise ValueError(f"Malformed status line: {line[:80]!r}")
+    return int(parts[1])
+
+
+class HttpConnection:
+    """One keep-alive HTTP/1.1 connection; reconnects after errors or close."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def _ensure(self) -> bool:
+        """Open a connection if needed; returns True when an existing one is reused."""
+        if self.writer is not None and not self.writer.is_closing():
+            return True
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        sock = self.writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return False
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        self.reader = self.writer = None
+
+    async def _send(self, payload: bytes) -> bytes:
+        """Write a request and return its status line (empty if the peer closed)."""
+        assert self.reader is not None and self.writer is not None
+        self.writer.write(payload)
+        await self.writer.drain()
+        return await self.reader.readline()
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None) -> int:
+        """Send one request and drain the response; returns the status code.
+
+        A server may drop an idle or errored keep-alive connection without
+        saying so (uvicorn does after a 500). If a reused connection fails
+        before any status line arrives, the request is resent once on a fresh
+        connection so the failure is not charged to this request.
+        """
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                "Connection: keep-alive"]
+        if body is not None:
+            head += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        payload = ("\r\n".join(head) + "\r\n\r\n").encode() + (body or b"")
+
+        reused = await self._ensure()
+        try:
+            status_line = await self._send(payload)
+        except ConnectionError:
+            if not reused:
+                raise
+            status_line = b""
+        if not status_line and reused:
+            await self.close()
+            await self._ensure()
+            status_line = await self._send(payload)
+        if not status_line:
+            raise ConnectionError("Server closed the connection")
+        assert self.reader is not None
+        status = parse_status_line(status_line)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            await self.reader.read()
+            await self.close()
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status
+
+
+# ---------- load generation ----------
+
+@dataclass
+class Sample:
+    endpoint: str
+    latency_s: float
+    ok: bool
+    status: Optional[int] = None
+    error: Optional[str] = None
+
+
+async def run_load(
+    host: str,
+    port: int,
+    scenario: Scenario,
+    concurrency: int = 8,
+    duration: Optional[float] = 10.0,
+    total_requests: Optional[int] = None,
+    rate: Optional[float] = None,
+    seed: Optional[int] = None,
+    timeout: float = 10.0,
+) -> Tuple[List[Sample], float]:
+    """Drive the server with `concurrency` workers; returns (samples, elapsed_s).
+
+    Without `rate` every worker runs closed-loop (next request as soon as the
+    previous one returns). With `rate` requests are dispatched on a fixed
+    global schedule and latency is measured from the scheduled start, so a
+    stalled server is not hidden by workers backing off.
+
+    A request that takes longer than `timeout` seconds is recorded as a
+    "Timeout" error and its connection is dropped.
+    """
+    if duration is None and total_requests is None:
+        raise ValueError("run_load needs a duration or a request count")
+    rng = random.Random(seed)
+    names = [n for n, w in scenario.mix.items() if w > 0]
+    weights = [scenario.mix[n] for n in names]
+    hint_bodies = [json.dumps(s).encode() for s in scenario.hint_states]
+
+    samples: List[Sample] = []
+    issued = 0
+    start = time.perf_counter()
+    deadline = start + duration if duration is not None else None
+
+    def next_slot() -> Optional[int]:
+        nonlocal issued
+        if total_requests is not None and issued >= total_requests:
+            return None
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        issued += 1
+        return issued - 1
+
+    async def worker():
+        conn = HttpConnection(host, port)
+        try:
+            while True:
+                i = next_slot()
+                if i is None:
+                    return
+                t0 = time.perf_counter()
+                if rate:
+                    t0 = start + i / rate
+                    if deadline is not None and t0 >= deadline:
+                        return
+                    delay = t0 - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                ep = ENDPOINTS[rng.choices(names, weights)[0]]
+                body = hint_bodies[i % len(hint_bodies)] if ep.name == "hint" else None
+                try:
+                    status = await asyncio.wait_for(
+                        conn.request(ep.method, ep.path, body), timeout)
+                    samples.append(Sample(ep.name, time.perf_counter() - t0,
+                                          200 <= status < 300, status=status))
+                except asyncio.TimeoutError:
+                    samples.append(Sample(ep.name, time.perf_counter() - t0, False,
+                                          error="Timeout"))
+                    await conn.close()
+                except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+                    samples.append(Sample(ep.name, time.perf_counter() - t0, False,
+                                          error=type(e).__name__))
+                    await conn.close()
+        finally:
+            await conn.close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+# ---------- reporting ----------
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1,
+                   math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summarize(samples: Sequence[Sample], elapsed_s: float) -> dict:
+    lat = sorted(s.latency_s * 1000 for s in samples)
+    errors = [s for s in samples if not s.ok]
+    statuses: Dict[str, int] = {}
+    for s in samples:
+        key = str(s.status) if s.status is not None else (s.error or "error")
+        statuses[key] = statuses.get(key, 0) + 1
+    out = {
+        "requests": len(samples),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / len(samples), 6) if samples else 0.0,
+        "throughput_rps": round(len(samples) / elapsed_s, 3) if elapsed_s > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(lat) / len(lat), 3) if lat else 0.0,
+            "max": round(lat[-1], 3) if lat else 0.0,
+            **{f"p{int(p)}": round(percentile(lat, p), 3) for p in PERCENTILES},
+        },
+        "status_counts": statuses,
+    }
+    return out
+
+
+def build_report(samples: Sequence[Sample], elapsed_s: float, scenario: Scenario, config: dict) -> dict:
+    by_ep: Dict[str, List[Sample]] = {}
+    for s in samples:
+        by_ep.setdefault(s.endpoint, []).append(s)
+    return {
+        "scenario": scenario.name,
+        "config": config,
+        "generated_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "elapsed_s": round(elapsed_s, 3),
+        "overall": summarize(samples, elapsed_s),
+        "endpoints": {name: summarize(group, elapsed_s) for name, group in sorted(by_ep.items())},
+    }
+
+
+def _flatten(d: dict, prefix: str = "") -> Dict[str, float]:
+    flat: Dict[str, float] = {}
+    for k, v in d.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            flat.update(_flatten(v, key + "."))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            flat[key] = v
+    return flat
+
+
+def compare_reports(old: dict, new: dict) -> str:
+    """Text table of metric deltas (new vs old) for overall and per-endpoint stats."""
+    sections = {"overall": (old.get("overall", {}), new.get("overall", {}))}
+    for name in sorted(set(old.get("endpoints", {})) | set(new.get("endpoints", {}))):
+        sections[name] = (old.get("endpoints", {}).get(name, {}),
+                          new.get("endpoints", {}).get(name, {}))
+    lines = [f"{'metric':<36} {'old':>12} {'new':>12} {'delta':>9}"]
+    for section, (o, n) in sections.items():
+        fo, fn = _flatten(o), _flatten(n)
+        for key in sorted(set(fo) | set(fn)):
+            if key.startswith("status_counts."):
+                continue
+            a, b = fo.get(key), fn.get(key)
+            if a is None or b is None:
+                delta = "n/a"
+            elif a == 0:
+                delta = "+0.0%" if b == 0 else "new"
+            else:
+                delta = f"{(b - a) / a * 100:+.1f}%"
+            fmt = lambda x: "-" if x is None else f"{x:g}"  # noqa: E731
+            lines.append(f"{section + '.' + key:<36} {fmt(a):>12} {fmt(b):>12} {delta:>9}")
+    return "\n".join(lines)
+
+
+# ---------- local server ----------
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_ready(host: str, port: int, timeout: float = 15.0):
+    conn = HttpConnection(host, port)
+    end = time.perf_counter() + timeout
+    try:
+        while True:
+            remaining = max(0.1, end - time.perf_counter())
+            try:
+                if await asyncio.wait_for(conn.request("GET", "/healthz"), remaining) == 200:
+                    return
+            except (asyncio.TimeoutError, OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+                await conn.close()
+            if time.perf_counter() > end:
+                raise RuntimeError(f"Server on {host}:{port} did not become ready")
+            await asyncio.sleep(0.1)
+    finally:
+        await conn.close()
+
+
+def start_server(host: str, port: int, workers: int = 1) -> subprocess.Popen:
+    """Start uvicorn serving app.main:app in a child process."""
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", host,
+           "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    return subprocess.Popen(cmd, cwd=SERVER_DIR)
+
+
+def stop_server(proc: subprocess.Popen):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# ---------- CLI ----------
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", type=str, default=None,
+                    help="target an already running server instead of starting uvicorn")
+    ap.add_argument("--server-workers", type=int, default=1,
+                    help="uvicorn worker processes for the local server")
+    ap.add_argument("--scenario", type=str, default=None,
+                    help="scenario JSON with endpoint mix and hint states")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--duration", type=float, default=10.0,
+                    help="seconds to run (ignored when --requests is set)")
+    ap.add_argument("--requests", type=int, default=None,
+                    help="stop after this many requests")
+    ap.add_argument("--rate", type=float, default=None,
+                    help="target requests/s across all workers (open loop)")
+    ap.add_argument("--warmup", type=float, default=1.0,
+                    help="seconds of unrecorded traffic before measuring")
+    ap.add_argument("--timeout", type=float, default=10.0,
+                    help="per-request timeout in seconds; slower requests count as errors")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--out", type=str, default=None, help="write JSON report here")
+    ap.add_argument("--compare", type=str, default=None,
+                    help="older JSON report to diff against")
+    args = ap.parse_args(argv)
+
+    if args.requests is not None and args.requests <= 0:
+        ap.error("--requests must be positive")
+    if args.requests is None and args.duration <= 0:
+        ap.error("--duration must be positive (or pass --requests)")
+
+    scenario = load_scenario(args.scenario) if args.scenario else Scenario()
+    duration = None if args.requests else args.duration
+
+    proc = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    else:
+        host, port = "127.0.0.1", free_port()
+        proc = start_server(host, port, args.server_workers)
+
+    try:
+        asyncio.run(wait_ready(host, port))
+        if args.warmup > 0:
+            asyncio.run(run_load(host, port, scenario, args.concurrency,
+                                 duration=args.warmup, seed=args.seed,
+                                 timeout=args.timeout))
+        print(f"Load test '{scenario.name}' → {host}:{port} "
+              f"(concurrency={args.concurrency}, rate={args.rate or 'max'})")
+        samples, elapsed = asyncio.run(run_load(
+            host, port, scenario, args.concurrency, duration=duration,
+            total_requests=args.requests, rate=args.rate, seed=args.seed,
+            timeout=args.timeout))
+    finally:
+        if proc is not None:
+            stop_server(proc)
+
+    config = {
+        "concurrency": args.concurrency,
+        "duration": duration,
+        "requests": args.requests,
+        "rate": args.rate,
+        "seed": args.seed,
+        "timeout": args.timeout,
+        "mix": scenario.mix,
+        "hint_states": len(scenario.hint_states),
+        "server": args.url or f"local uvicorn x{args.server_workers}",
+    }
+    report = build_report(samples, elapsed, scenario, config)
+    text = json.dumps(report, indent=2, sort_keys=True)
+
+    overall = report["overall"]
+    lat = overall["latency_ms"]
+    print(f"✅ {overall['requests']} requests in {report['elapsed_s']}s — "
+          f"{overall['throughput_rps']} req/s, errors {overall['error_rate'] * 100:.2f}%")
+    print(f"   latency ms: p50={lat['p50']} p90={lat['p90']} p95={lat['p95']} "
+          f"p99={lat['p99']} max={lat['max']}")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(text + "\n", encoding="utf-8")
+        print(f"🗂️  Report saved to {out_path}")
+    if args.compare:
+        old = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print(compare_reports(old, report))
+    return 1 if overall["requests"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Literal, Optional, Tuple
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from .rules import RULE_LIST
 
@@ -24,9 +24,17 @@ class Meta(BaseModel):
     generated_utc: Optional[str] = None
     initial_count: Optional[int] = None
     colors_sha1_12: Optional[str] = None
+    grade: Optional[Dict[str, Any]] = None
 
 class BoardFile(BaseModel):
     meta: Meta
     colors: List[List[ColorKey]]
     ruleOverrides: Optional[List[RuleOverride]] = None
     initial: List[Tuple[int,int]]
+
+class HintRequest(BaseModel):
+    state: Any
+
+class HintResponse(BaseModel):
+    changed: bool
+    state: Any
@@ -0,0 +1,146 @@
+"""
+profiling.py – per-phase wall/CPU timing and solver-call accounting for generator runs.
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import time
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    self_wall_s: float = 0.0
+    self_cpu_s: float = 0.0
+
+
+@dataclass
+class SolverCallStats:
+    calls: int = 0
+    failed: int = 0
+    rounds_total: int = 0
+    rounds_max: int = 0
+    rounds_hist: Dict[int, int] = field(default_factory=dict)
+
+    def add(self, rounds: Optional[int]):
+        self.calls += 1
+        if rounds is None:
+            self.failed += 1
+            return
+        self.rounds_total += rounds
+        self.rounds_max = max(self.rounds_max, rounds)
+        self.rounds_hist[rounds] = self.rounds_hist.get(rounds, 0) + 1
+
+
+class PhaseProfiler:
+    """Nested phase timer; phases are keyed by their ';'-joined stack path.
+
+    A disabled profiler keeps the same interface but records nothing, so
+    callers can use it unconditionally.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.phases: Dict[str, PhaseStats] = {}
+        self.solver: Dict[str, SolverCallStats] = {}
+        # open frames: [path, wall_start, cpu_start, child_wall, child_cpu]
+        self._stack: List[list] = []
+
+    @property
+    def current_path(self) -> str:
+        return self._stack[-1][0] if self._stack else ""
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        parent = self.current_path
+        path = f"{parent};{name}" if parent else name
+        frame = [path, time.perf_counter(), time.process_time(), 0.0, 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - frame[1]
+            cpu = time.process_time() - frame[2]
+            self._stack.pop()
+            st = self.phases.setdefault(path, PhaseStats())
+            st.calls += 1
+            st.wall_s += wall
+            st.cpu_s += cpu
+            st.self_wall_s += wall - frame[3]
+            st.self_cpu_s += cpu - frame[4]
+            if self._stack:
+                self._stack[-1][3] += wall
+                self._stack[-1][4] += cpu
+
+    def solve(self, solve_fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run `solve_fn` in a phase named after it and count it as a solver call.
+
+        The call is attributed to the calling phase with `result.steps` rounds;
+        a ValueError (contradiction) is counted as failed and re-raised.
+        """
+        try:
+            with self.phase(solve_fn.__name__):
+                res = solve_fn(*args, **kwargs)
+        except ValueError:
+            self.solver_call(None)
+            raise
+        self.solver_call(res.steps)
+        return res
+
+    def solver_call(self, rounds: Optional[int]):
+        """Count one solver call from the current phase (rounds=None on contradiction)."""
+        if not self.enabled:
+            return
+        self.solver.setdefault(self.current_path, SolverCallStats()).add(rounds)
+
+    # ---------- output ----------
+
+    def as_dict(self) -> dict:
+        roots = [st for path, st in self.phases.items() if ";" not in path]
+        calls = sum(s.calls for s in self.solver.values())
+        rounds = sum(s.rounds_total for s in self.solver.values())
+        ok = calls - sum(s.failed for s in self.solver.values())
+        return {
+            "total_wall_s": round(sum(s.wall_s for s in roots), 6),
+            "total_cpu_s": round(sum(s.cpu_s for s in roots), 6),
+            "phases": {
+                path: {k: round(v, 6) if isinstance(v, float) else v
+                       for k, v in asdict(st).items()}
+                for path, st in self.phases.items()
+            },
+            "solver": {
+                "calls": calls,
+                "rounds_total": rounds,
+                "rounds_mean": round(rounds / ok, 3) if ok else 0.0,
+                "by_phase": {
+                    path: {**asdict(st),
+                           "rounds_hist": {str(k): v for k, v in sorted(st.rounds_hist.items())}}
+                    for path, st in self.solver.items()
+                },
+            },
+        }
+
+    def format_table(self) -> str:
+        lines = [f"{'phase':<52} {'calls':>7} {'wall s':>9} {'cpu s':>9} {'self s':>9} {'solves':>7}"]
+        for path, st in sorted(self.phases.items()):
+            depth = path.count(";")
+            name = "  " * depth + path.rsplit(";", 1)[-1]
+            solves = self.solver.get(path)
+            lines.append(
+                f"{name:<52} {st.calls:>7} {st.wall_s:>9.4f} {st.cpu_s:>9.4f} "
+                f"{st.self_wall_s:>9.4f} {solves.calls if solves else '':>7}")
+        return "\n".join(lines)
+
+    def write_collapsed(self, path: str | Path):
+        """Collapsed-stack dump (`a;b;c <self µs>` per line) for flamegraph.pl / speedscope."""
+        lines = [f"{p} {max(0, round(st.self_wall_s * 1e6))}"
+                 for p, st in sorted(self.phases.items())]
+        Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
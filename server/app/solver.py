@@ -82,6 +82,108 @@ class SolverLogger:
             [asdict(s) for s in self.snapshots], indent=2), encoding="utf-8")
 
 
+class DeductionTrace(SolverLogger):
+    """Lightweight logger that records how each cell got fixed instead of snapshots.
+
+    Pass it as `logger=` to deterministic_solve. Per cell it keeps:
+      - depth:   deduction depth (givens 0; otherwise 1 + deepest premise used)
+      - round:   solver round in which the cell became fixed
+      - method:  "given", "force", "elimination" (one clue) or "combined"
+                 (eliminations from several clues were needed)
+      - rule:    name of the rule that fixed it
+    """
+
+    def __init__(self):
+        super().__init__(keep_domains=False)
+        self.R = self.C = 0
+        self.depth: List[List[Optional[int]]] = []
+        self.round: List[List[Optional[int]]] = []
+        self.method: List[List[Optional[str]]] = []
+        self.rule: List[List[Optional[str]]] = []
+        self._elim_depth: List[List[int]] = []
+        self._elim_sources: List[List[Set[Coord]]] = []
+        self._by: List[List[Optional[Tuple[Coord, int]]]] = []
+        self.rounds = 0
+
+    def _premise_depth(self, state: SolverState, src: Coord, target: Coord,
+                       col: Color, forced: bool, step: int) -> int:
+        """Deepest fact the clue at `src` relied on to deduce `col` at `target`.
+
+        A quota elimination only needs the neighbors already fixed to `col`; a
+        force also needs every neighbor that was ruled out for `col`.
+        """
+        r, c = src
+        d = self.depth[r][c] or 0
+        for rr, cc in neighbors8(r, c, state.R, state.C):
+            if (rr, cc) == target:
+                continue
+            nd = self.depth[rr][cc]
+            if nd is not None:
+                if self._by[rr][cc] == (src, step):
+                    continue  # forced alongside target by the same clue
+                if forced or state.fixed[rr][cc] == col:
+                    d = max(d, nd)
+            elif forced and col not in state.domains[rr][cc]:
+                d = max(d, self._elim_depth[rr][cc])
+        return d
+
+    def _mark_fixed(self, r: int, c: int, depth: int, step: int, method: str, rule: str):
+        self.depth[r][c] = depth
+        self.round[r][c] = step
+        self.method[r][c] = method
+        self.rule[r][c] = rule
+
+    def snapshot(
+        self,
+        step: int,
+        phase: str,
+        message: str,
+        state: SolverState,
+        changed: List[Tuple[Coord, Dict[str, object]]] | None = None,
+        include_board_text: bool = True,
+    ):
+        if phase == "INIT":
+            self.R, self.C = state.R, state.C
+            self.depth = [[None] * state.C for _ in range(state.R)]
+            self.round = [[None] * state.C for _ in range(state.R)]
+            self.method = [[None] * state.C for _ in range(state.R)]
+            self.rule = [[None] * state.C for _ in range(state.R)]
+            self._elim_depth = [[0] * state.C for _ in range(state.R)]
+            self._elim_sources = [[set() for _ in range(state.C)]
+                                  for _ in range(state.R)]
+            self._by = [[None] * state.C for _ in range(state.R)]
+            for r in range(state.R):
+                for c in range(state.C):
+                    if state.fixed[r][c] is not None:
+                        self._mark_fixed(r, c, 0, 0, "given", phase)
+            return
+
+        for (r, c), delta in changed or []:
+            if self.depth[r][c] is not None:
+                continue
+            src = delta.get("by")
+            if "remove" in delta and src is not None:
+                src = tuple(src)
+                d = self._premise_depth(
+                    state, src, (r, c), delta["remove"], False, step) + 1
+                self._elim_depth[r][c] = max(self._elim_depth[r][c], d)
+                self._elim_sources[r][c].add(src)
+            if state.fixed[r][c] is None:
+                continue
+            if "fix" in delta and src is not None:
+                src = tuple(src)
+                d = self._premise_depth(
+                    state, src, (r, c), delta["fix"], True, step) + 1
+                self._mark_fixed(r, c, d, step, "force", phase)
+                self._by[r][c] = (src, step)
+            else:
+                method = "combined" if len(
+                    self._elim_sources[r][c]) > 1 else "elimination"
+                self._mark_fixed(r, c, max(1, self._elim_depth[r][c]),
+                                 step, method, phase)
+            self.rounds = max(self.rounds, step)
+
+
 # ---------------------------
 # State
 # ---------------------------
@@ -216,7 +318,7 @@ class NeighborClueRule:
                                     step, self.name,
                                     f"Quota reached at {(r, c)}; remove {col} from {(rr, cc)}",
                                     state, changed=[
-                                        ((rr, cc), {"remove": col})],
+                                        ((rr, cc), {"remove": col, "by": (r, c)})],
                                     include_board_text=False,
                                 )
 
@@ -230,7 +332,8 @@ class NeighborClueRule:
                                 logger.snapshot(
                                     step, self.name,
                                     f"Force {col} at {(rr, cc)}) (need==candidates from {(r, c)})",
-                                    state, changed=[((rr, cc), {"fix": col})],
+                                    state, changed=[
+                                        ((rr, cc), {"fix": col, "by": (r, c)})],
                                     include_board_text=False,
                                 )
 
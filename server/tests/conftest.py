@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Make `app` importable when pytest is run from the repository root.
+SERVER_DIR = Path(__file__).resolve().parents[1]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
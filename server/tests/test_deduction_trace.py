@@ -0,0 +1,57 @@
+"""Hand-checked DeductionTrace examples; these pin the numbers behind meta.difficulty."""
+
+from app.grader import grade_board
+from app.solver import DeductionTrace, deterministic_solve
+
+
+def trace_of(clues, palette, givens):
+    trace = DeductionTrace()
+    res = deterministic_solve(clues, palette, givens, logger=trace)
+    return res, trace
+
+
+def test_force_then_quota_elimination_chain():
+    # colors: a a b, clues = same-color neighbor counts, (0,0) given.
+    # Round 1 scans left to right:
+    #   (0,0)=a needs 1 more a; (0,1) is the only candidate -> force a, depth 1.
+    #   (0,1)=a has its 1 a-neighbor; remove a from (0,2) -> b, depth 2
+    #   (premises: (0,1) at depth 1 and (0,0) at depth 0).
+    res, trace = trace_of([[1, 1, 0]], ("a", "b"), {(0, 0): "a"})
+    assert res.fully_solved
+    assert trace.depth == [[0, 1, 2]]
+    assert trace.round == [[0, 1, 1]]
+    assert trace.method == [["given", "force", "elimination"]]
+    assert trace.rounds == 1
+
+
+def test_eliminations_from_two_clues_are_combined():
+    # colors: a c b with a and b given, every clue 0.
+    # (0,0) removes a from (0,1), (0,2) removes b -> c; both premises are givens.
+    res, trace = trace_of([[0, 0, 0]], ("a", "b", "c"),
+                          {(0, 0): "a", (0, 2): "b"})
+    assert res.fully_solved
+    assert trace.depth == [[0, 1, 0]]
+    assert trace.method == [["given", "combined", "given"]]
+    assert trace.rounds == 1
+
+
+def test_cells_forced_together_do_not_feed_each_other():
+    # colors: a a a, center given with clue 2: both sides are forced by the
+    # same clue in the same step, so the second one stays at depth 1, not 2.
+    res, trace = trace_of([[1, 2, 1]], ("a", "b"), {(0, 1): "a"})
+    assert res.fully_solved
+    assert trace.depth == [[1, 0, 1]]
+    assert trace.method == [["force", "given", "force"]]
+
+
+def test_grade_board_uses_trace_metrics():
+    colors = [["a", "c", "b"]]
+    grade = grade_board(colors, [[0, 0, 0]], ("a", "b", "c"), [(0, 0), (0, 2)])
+    assert grade.solved
+    assert (grade.rounds, grade.max_depth, grade.deduced_cells) == (1, 1, 1)
+    assert grade.higher_order_share == 1.0
+    assert grade.difficulty == "expert"
+
+    grade = grade_board([["a", "a", "b"]], [[1, 1, 0]], ("a", "b"), [(0, 0)])
+    assert (grade.rounds, grade.max_depth, grade.higher_order_share) == (1, 2, 0.0)
+    assert grade.difficulty == "easy"
@@ -0,0 +1,28 @@
+"""Generated boards must grade as solved from their minimal givens."""
+
+import pytest
+
+from app.generator import generate, minimality_pass
+from app.solver import deterministic_solve
+
+
+# seeds that used to lose two mutually redundant givens in minimality_pass
+@pytest.mark.parametrize("seed", [6, 13, 40, 53, 55])
+def test_generated_board_is_solved_from_its_givens(seed):
+    data = generate(7, 7, ["a", "b", "c"], 0.4, seed=seed)
+    assert data["meta"]["grade"]["solved"]
+    assert data["meta"]["difficulty"] != "unsolved"
+    givens = {(r, c): data["colors"][r][c] for r, c in data["initial"]}
+    assert deterministic_solve(data["clues"], ["a", "b", "c"], givens).fully_solved
+
+
+def test_minimality_pass_keeps_one_of_two_redundant_givens():
+    # colors a a: either given alone solves the board, so exactly one must stay
+    colors, clues = [["a", "a"]], [[1, 1]]
+    kept = minimality_pass(colors, clues, ["a", "b"], [(0, 0), (0, 1)])
+    assert len(kept) == 1
+
+
+def test_generate_refuses_unsolved_board():
+    with pytest.raises(RuntimeError):
+        generate(7, 7, ["a", "b", "c"], 0.4, seed=6, max_rounds=0)
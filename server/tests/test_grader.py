@@ -0,0 +1,37 @@
+"""grade_batch skips files it cannot grade instead of aborting the batch."""
+
+import json
+
+from app.grader import grade_batch
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def test_grade_batch_skips_unsupported_and_malformed(tmp_path):
+    board = write_json(tmp_path / "board.json", {
+        "meta": {"palette": ["a", "b"]},
+        "colors": [["a", "a", "b"]],
+        "clues": [[1, 1, 0]],
+        "initial": [[0, 0]],
+    })
+    knight = {
+        "meta": {"palette": ["a", "b"], "rules": ["neighbor", "knight"]},
+        "colors": [["a", "a", "b"]],
+        "clues": [[{"rule": "knight", "value": 0}, None, None]],
+        "initial": [[0, 0]],
+    }
+    knight_path = write_json(tmp_path / "knight.json", knight)
+    summary = write_json(tmp_path / "grades.json", {"board.json": {"difficulty": "easy"}})
+
+    for jobs in (1, 2):
+        results = {p: (g, why) for p, g, why in grade_batch(
+            [board, knight_path, summary], write=True, jobs=jobs)}
+        assert results[str(board)][0].difficulty == "easy"
+        assert results[str(knight_path)] == (None, "unsupported rules: knight")
+        assert results[str(summary)] == (None, "not a board file")
+
+    # skipped boards are left untouched even with write=True
+    assert json.loads(knight_path.read_text(encoding="utf-8")) == knight
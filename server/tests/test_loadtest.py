@@ -0,0 +1,65 @@
+"""Pure report helpers of the load tester."""
+
+import pytest
+
+from app.loadtest import Sample, compare_reports, parse_status_line, percentile, summarize
+
+
+@pytest.mark.parametrize("n, p, expected_rank", [
+    (100, 99, 99),   # not the max
+    (100, 50, 50),
+    (100, 100, 100),
+    (10, 90, 9),     # not the max
+    (10, 95, 10),
+    (10, 50, 5),
+    (3, 50, 2),
+    (1, 99, 1),
+])
+def test_percentile_is_nearest_rank(n, p, expected_rank):
+    values = list(range(1, n + 1))
+    assert percentile(values, p) == expected_rank
+
+
+def test_percentile_of_nothing_is_zero():
+    assert percentile([], 99) == 0.0
+
+
+def test_summarize_counts_errors_by_status_and_exception():
+    samples = [
+        Sample("hint", 0.001, True, status=200),
+        Sample("hint", 0.002, True, status=200),
+        Sample("hint", 0.003, False, status=500),
+        Sample("hint", 0.010, False, error="Timeout"),
+    ]
+    out = summarize(samples, elapsed_s=2.0)
+    assert out["requests"] == 4
+    assert out["errors"] == 2
+    assert out["error_rate"] == 0.5
+    assert out["throughput_rps"] == 2.0
+    assert out["status_counts"] == {"200": 2, "500": 1, "Timeout": 1}
+    assert out["latency_ms"]["p50"] == 2.0
+    assert out["latency_ms"]["max"] == 10.0
+
+
+def test_compare_reports_marks_missing_and_new_metrics():
+    old = {"overall": {"requests": 10, "errors": 0, "status_counts": {"200": 10}},
+           "endpoints": {"board": {"requests": 5}}}
+    new = {"overall": {"requests": 20, "errors": 3, "status_counts": {"200": 17}},
+           "endpoints": {"hint": {"requests": 5}}}
+    rows = {line.split()[0]: line.split()[1:]
+            for line in compare_reports(old, new).splitlines()[1:]}
+    assert rows["overall.requests"] == ["10", "20", "+100.0%"]
+    assert rows["overall.errors"] == ["0", "3", "new"]
+    assert rows["board.requests"] == ["5", "-", "n/a"]
+    assert rows["hint.requests"] == ["-", "5", "n/a"]
+    assert not any(k.startswith("overall.status_counts") for k in rows)
+
+
+@pytest.mark.parametrize("line", [b"garbage\r\n", b"HTTP/1.1\r\n", b"HTTP/1.1 OK\r\n", b"\r\n"])
+def test_parse_status_line_rejects_malformed(line):
+    with pytest.raises(ValueError):
+        parse_status_line(line)
+
+
+def test_parse_status_line():
+    assert parse_status_line(b"HTTP/1.1 503 Service Unavailable\r\n") == 503
@@ -0,0 +1,80 @@
+"""PhaseProfiler bookkeeping: nesting, self time, solver-call attribution, output."""
+
+import re
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.profiling import PhaseProfiler
+
+
+def fake_solve(steps):
+    return SimpleNamespace(steps=steps)
+
+
+def contradiction():
+    raise ValueError("Contradiction")
+
+
+def run_nested(prof):
+    with prof.phase("outer"):
+        time.sleep(0.002)
+        with prof.phase("inner"):
+            prof.solver_call(3)
+            prof.solver_call(3)
+            time.sleep(0.002)
+        with prof.phase("inner"):
+            prof.solver_call(5)
+            prof.solver_call(None)
+        prof.solve(fake_solve, 2)
+        with pytest.raises(ValueError):
+            prof.solve(contradiction)
+
+
+def test_nested_phases_and_solver_calls():
+    prof = PhaseProfiler()
+    run_nested(prof)
+    d = prof.as_dict()
+
+    phases = d["phases"]
+    assert set(phases) == {"outer", "outer;inner", "outer;fake_solve", "outer;contradiction"}
+    assert phases["outer"]["calls"] == 1
+    assert phases["outer;inner"]["calls"] == 2
+    for st in phases.values():
+        assert 0 <= st["self_wall_s"] <= st["wall_s"]
+    # outer's self time excludes the time spent in its children
+    children = sum(phases[p]["wall_s"] for p in phases if p.startswith("outer;"))
+    assert phases["outer"]["self_wall_s"] == pytest.approx(
+        phases["outer"]["wall_s"] - children, abs=1e-5)
+    assert d["total_wall_s"] == phases["outer"]["wall_s"]
+
+    solver = d["solver"]
+    assert solver["calls"] == 6
+    assert solver["rounds_total"] == 13
+    inner = solver["by_phase"]["outer;inner"]
+    assert (inner["calls"], inner["failed"], inner["rounds_max"]) == (4, 1, 5)
+    assert inner["rounds_hist"] == {"3": 2, "5": 1}
+    # prof.solve() counts against the caller, not the solver's own phase
+    outer = solver["by_phase"]["outer"]
+    assert (outer["calls"], outer["failed"], outer["rounds_hist"]) == (2, 1, {"2": 1})
+
+
+def test_write_collapsed(tmp_path):
+    prof = PhaseProfiler()
+    run_nested(prof)
+    out = tmp_path / "profile.collapsed"
+    prof.write_collapsed(out)
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert [line.rsplit(" ", 1)[0] for line in lines] == sorted(prof.phases)
+    for line in lines:
+        assert re.fullmatch(r"[\w;]+ \d+", line)
+    us = dict(line.rsplit(" ", 1) for line in lines)
+    assert int(us["outer;inner"]) == round(prof.phases["outer;inner"].self_wall_s * 1e6)
+
+
+def test_disabled_profiler_records_nothing():
+    prof = PhaseProfiler(enabled=False)
+    run_nested(prof)
+    assert prof.phases == {} and prof.solver == {}
+    assert prof.as_dict()["solver"]["calls"] == 0